@@ -11,6 +11,8 @@ Features:
 ---------
 - Downloads and logs messages from Discord channels.
 - Downloads attachments (images) and saves them to a dedicated directory.
+- Creates a small thumbnail of each downloaded image for the viewer.
+- Backs up several channels at once and downloads attachments concurrently.
 - Tracks progress using a dynamic progress bar for both messages and image downloads.
 - Supports resuming from the last fetched message using checkpoint files.
 - Provides logging for errors, status, and performance.
@@ -19,7 +21,7 @@ Features:
 Usage:
 ------
 1. Ensure that your Discord user token is set in a `.env` file with the key `DISCORD_TOKEN`.
-2. Define the channels you want to back up in the `channels.py` file as a dictionary of channel names and IDs.
+2. Define the channels you want to back up in the `channels.py` file as a tuple of (channel name, channel ID) pairs.
 3. Install the required dependencies:
    $ pip install -r requirements.txt
 4. Run the script:
@@ -40,16 +42,24 @@ Date:
 """
 
 import requests
-import json
+import orjson
 import time
 import os
+import queue
+import threading
+import sys
+import operator
 import logging
 from tqdm import tqdm
+from concurrent.futures import ThreadPoolExecutor, CancelledError
 from dotenv import load_dotenv
-from channels import CHANNELS  # Import the CHANNELS dictionary from channels.py
-from topics import TOPICS  # Import the TOPICS dictionary from topics.py
-from urllib.parse import urlparse
+from channels import CHANNELS  # Import the CHANNELS (name, ID) pairs from channels.py
+from topics import TOPICS  # Import the TOPICS (name -> ID) mapping from topics.py
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from logging.handlers import RotatingFileHandler
+from pathlib import Path
+from PIL import Image, UnidentifiedImageError
 
 # Load environment variables from the .env file
 load_dotenv()
@@ -60,151 +70,470 @@ DISCORD_TOKEN = os.getenv("DISCORD_TOKEN")
 # Define headers to impersonate a web browser (Chrome in this case)
 headers = {
     "Authorization": DISCORD_TOKEN,  # Use the user token directly here
-    "Content-Type": "application/json",
     "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/89.0.4389.82 Safari/537.36",
 }
 
-# Define the delay between requests to avoid hitting rate limits
-delay_between_requests = 1.5  # Adjust based on rate limiting
+# Define how many channels/topics are backed up at the same time
+max_concurrent_channels = 5
+
+# Define how many attachments are downloaded at the same time (shared by all channels)
+max_concurrent_downloads = 8
+
+# Create one session for the whole run so TCP/TLS connections are kept alive and reused;
+# size the pool so every concurrent request gets its own warm connection.
+# 429 is not retried here: fetch_page handles it, so a global limit pauses every channel thread
+session = requests.Session()
+session.headers.update(headers)
+session.mount("https://", HTTPAdapter(
+    pool_connections=32,
+    pool_maxsize=max_concurrent_channels + max_concurrent_downloads,
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[500, 502, 503, 504], raise_on_status=False),
+))
+
+# Define how long to wait on a stalled request before giving up (seconds)
+request_timeout = 30
+
+# Shared rate limit state: a global 429 pauses every channel thread until this time.monotonic() value
+rate_limit_lock = threading.Lock()
+global_resume_at = 0.0
+
+# Set on Ctrl-C; only the main thread receives the interrupt, so channel threads check this
+# and stop after the page they are on (rate limit waits use it to wake up early)
+stop_requested = threading.Event()
+
+# Define the size of the thumbnails created for the viewer (nw47-offsite-discord.py)
+thumbnail_size = (200, 200)
+
+# Map image extensions to their Pillow format, so opening an image skips format detection
+thumbnail_formats = {'.jpg': 'JPEG', '.jpeg': 'JPEG', '.png': 'PNG', '.gif': 'GIF'}
+
+# Fields read from every fetched message, looked up in one call
+message_fields = operator.itemgetter("timestamp", "author", "content")
+
+# Thread pool used to download attachments concurrently
+download_executor = ThreadPoolExecutor(max_workers=max_concurrent_downloads)
 
 # Set up logging
 log_file = 'discord_backup.log'
 
+# Define the log level from the .env file (e.g. LOG_LEVEL=WARNING skips the per-page info lines)
+log_level = os.getenv("LOG_LEVEL", "INFO").upper()
+
+# Fall back to INFO on anything that is not a level name (the warning is logged once logging is set up)
+unknown_log_level = None
+if not isinstance(logging.getLevelName(log_level), int):
+    unknown_log_level, log_level = log_level, "INFO"
+
 # Configure logging with file rotation (10MB max, up to 5 backups)
 logging.basicConfig(
     handlers=[RotatingFileHandler(log_file, maxBytes=10 * 1024 * 1024, backupCount=5)],
-    level=logging.INFO,
+    level=log_level,
     format='%(asctime)s - %(levelname)s - %(message)s',
     datefmt='%Y-%m-%d %H:%M:%S'
 )
 
+if unknown_log_level:
+    logging.warning("Unknown LOG_LEVEL %r, using INFO", unknown_log_level)
+
 # Log that the script has started
 logging.info("Discord Backup Script Started")
 
 # Function to read the last fetched message ID from a checkpoint file
 def get_last_message_id(checkpoint_file):
-    if os.path.exists(checkpoint_file):
+    # Just try to open it: one syscall, and no window between an exists() check and the open
+    try:
         with open(checkpoint_file, "r") as f:
             return f.read().strip()
-    return None
+    except FileNotFoundError:
+        return None
 
-# Function to write the last fetched message ID to a checkpoint file
+# Function to write the last fetched message ID to a checkpoint file atomically
 def save_last_message_id(checkpoint_file, message_id):
-    with open(checkpoint_file, "w") as f:
+    tmp_file = f"{checkpoint_file}.tmp"
+    with open(tmp_file, "w") as f:
         f.write(message_id)
+    os.replace(tmp_file, checkpoint_file)
 
 # Function to download an image from a URL and save it to the images directory
-def download_image(url, image_dir, timestamp, username, image_pbar=None):
-    image_ext = os.path.splitext(urlparse(url).path)[1]
+def download_image(url, image_dir, timestamp, username, image_pbar=None, existing_images=(), image_size=0):
+    # Take the extension from the URL path with plain string slicing (no urlparse allocation)
+    query_start = url.find('?')
+    path = url[:query_start] if query_start >= 0 else url
+    dot = path.rfind('.')
+    image_ext = path[dot:] if dot > path.rfind('/') else ''
     image_name = f"{timestamp}_{username}{image_ext}"
-    image_path = os.path.join(image_dir, image_name)
+    image_path = image_dir / image_name
+    # The temporary name is unique per thread, so two attachments that map to the
+    # same image name never write into the same partial file
+    part_path = image_dir / f"{image_name}.{threading.get_ident()}.part"
+
+    # Skip images that were already downloaded by a previous run
+    if image_name in existing_images:
+        logging.debug("Image already downloaded: %s", image_name)
+        if image_pbar:
+            with image_pbar.get_lock():
+                image_pbar.update(image_size)
+        return image_name
 
     try:
-        response = requests.get(url, headers=headers)
-        if response.status_code == 200:
-            with open(image_path, 'wb') as img_file:
-                img_file.write(response.content)
-            logging.info(f"Downloaded image: {image_name} from {url}")
-            if image_pbar:
-                image_pbar.update(1)
-            return image_name
-        else:
-            logging.error(f"Failed to download image: {url}. Status code: {response.status_code}")
-            return None
+        # Stream the body to disk in chunks instead of buffering the whole image in memory,
+        # and time out a stalled transfer so it can't hold a download slot forever
+        with session.get(url, stream=True, timeout=request_timeout) as response:
+            if response.status_code == 200:
+                with open(part_path, 'wb') as img_file:
+                    for chunk in response.iter_content(chunk_size=64 * 1024):
+                        img_file.write(chunk)
+                        if image_pbar:
+                            with image_pbar.get_lock():
+                                image_pbar.update(len(chunk))
+                # Only give the image its final name once it is complete, so a partial file is never skipped
+                os.replace(part_path, image_path)
+                logging.debug("Downloaded image: %s from %s", image_name, url)
+                create_thumbnail(image_path, image_dir.parent / "thumbnails")
+                return image_name
+            else:
+                logging.error("Failed to download image: %s. Status code: %s", url, response.status_code)
+                return None
     except Exception as e:
-        logging.error(f"Error downloading image: {url}. Exception: {e}")
+        logging.error("Error downloading image: %s. Exception: %s", url, e)
+        # Don't leave the partial file behind; its per-thread name would never be reused
+        part_path.unlink(missing_ok=True)
         return None
 
-# Function to format and write messages to a text file, and check for images
-def write_messages_to_file(messages, backup_file_path, image_dir):
-    image_pbar = tqdm(total=len([msg for msg in messages if msg["attachments"]]), desc="Downloading images", leave=False)
+# Function to create the viewer's thumbnail of a downloaded image, so the viewer never has to decode it
+def create_thumbnail(image_path, thumbnail_dir):
+    image_format = thumbnail_formats.get(image_path.suffix.lower())
+    if image_format is None:
+        return
+
+    part_path = thumbnail_dir / f"{image_path.name}.{threading.get_ident()}.part"
+    try:
+        try:
+            img = Image.open(image_path, formats=[image_format])
+        except UnidentifiedImageError:
+            # Misnamed attachment (e.g. a JPEG served as .png): let Pillow detect the format
+            img = Image.open(image_path)
+        with img:
+            if img.format == 'JPEG':
+                # Let libjpeg decode at a reduced scale instead of decoding the full-size image
+                img.draft('RGB', (thumbnail_size[0] * 2, thumbnail_size[1] * 2))
+            img.thumbnail(thumbnail_size, Image.BILINEAR)
+            if image_format in ('PNG', 'GIF'):
+                img.save(part_path, "PNG")
+            else:
+                img.convert("RGB").save(part_path, "JPEG", quality=75)
+        os.replace(part_path, thumbnail_dir / image_path.name)
+    except Exception as e:
+        logging.error("Error creating thumbnail for %s: %s", image_path, e)
+        part_path.unlink(missing_ok=True)
+
+# Function to check the token once before any channel is fetched (also warms up the pooled connection)
+def check_token():
+    try:
+        response = session.get("https://discord.com/api/v9/users/@me", timeout=request_timeout)
+    except requests.exceptions.RequestException as e:
+        logging.error("Token check failed: %s", e)
+        return False
+
+    if response.status_code != 200:
+        logging.error("Token check failed: %s - %s", response.status_code, response.text)
+        return False
+    return True
+
+# Function to wait only as long as Discord's rate limit headers require
+def wait_for_rate_limit(response):
+    if response.headers.get("X-RateLimit-Remaining") == "0":
+        stop_requested.wait(float(response.headers.get("X-RateLimit-Reset-After", 0)))
+
+# Function to pause every channel thread after Discord reports a global rate limit
+def pause_all_requests(seconds):
+    global global_resume_at
+    with rate_limit_lock:
+        global_resume_at = max(global_resume_at, time.monotonic() + seconds)
+
+# Function to wait until any global rate limit pause is over
+def wait_for_global_rate_limit():
+    delay = global_resume_at - time.monotonic()
+    if delay > 0:
+        stop_requested.wait(delay)
+
+# Function to start downloading every attachment of a page as soon as it is fetched,
+# returning (timestamp, username, content, download futures) for each message
+def schedule_downloads(messages, image_dir, image_pbar, existing_images, scheduled_downloads):
+    entries = []
+    for message in messages:
+        timestamp, author, content = message_fields(message)
+        username = author["username"]
+        attachments = message.get("attachments")
+        futures = []
+        if attachments:
+            for attachment in attachments:
+                if "url" not in attachment:
+                    continue
+                image_url = attachment["url"]
+
+                # Download each attachment once per channel: a URL seen again (keyed without the
+                # signed query string, which changes between fetches) reuses the first download
+                url_key = image_url.split('?', 1)[0]
+                future = scheduled_downloads.get(url_key)
+                if future is None:
+                    # The bar counts bytes (Discord reports each attachment's size) and is shared
+                    # by every channel thread, so grow its total under its lock
+                    image_size = attachment.get("size", 0)
+                    with image_pbar.get_lock():
+                        image_pbar.total += image_size
+                    future = download_executor.submit(
+                        download_image, image_url, image_dir, timestamp, username, image_pbar, existing_images, image_size
+                    )
+                    scheduled_downloads[url_key] = future
+                futures.append(future)
+        entries.append((timestamp, username, content, futures))
+    return entries
+
+# Function to format and write a page of messages to the open backup file, once its images are downloaded
+def write_messages_to_file(entries, backup_file):
+    lines = []
+    lines_append = lines.append
+    for timestamp, username, content, futures in entries:
+        # Add the regular message content
+        lines_append(f"[{timestamp}] {username}: {content}\n")
+
+        # Wait for the attachments (images, files) of this message, in order
+        for future in futures:
+            image_name = future.result()
+            if image_name:
+                lines_append(f"[{timestamp}] {username} shared an image: images/{image_name}\n")
+
+    # Encode and write the whole page with a single call
+    backup_file.write("".join(lines).encode("utf-8"))
+
+    # One summary line per page instead of a log record per message/image
+    logging.info("Wrote %d messages and %d images to %s", len(entries), len(lines) - len(entries), backup_file.name)
+
+# Function to write queued pages in order while the next page is being fetched
+def write_pages(page_queue, writer_failed, backup_file, checkpoint_file, channel_pbar):
+    try:
+        while (page := page_queue.get()) is not None:
+            entries, page_last_id = page
+
+            # Write messages to the text file once their images are downloaded
+            write_messages_to_file(entries, backup_file)
+
+            # Checkpoint after every page; flush first so the checkpoint never runs ahead of the file
+            backup_file.flush()
+            save_last_message_id(checkpoint_file, page_last_id)
+            channel_pbar.update(len(entries))
+    except BaseException:
+        # Tell the fetch loop to stop, keep draining so it never blocks on a full queue, then report the error
+        writer_failed.set()
+        while page_queue.get() is not None:
+            pass
+        raise
+
+# Function to fetch one page of messages after last_message_id, waiting out any rate limit.
+# Returns (messages, response), or None if the page could not be fetched.
+def fetch_page(request, url, last_message_id, backup_type, item_name):
+    # Get only messages after the last saved one (the limit is passed as an integer)
+    params = {"limit": int(100), "after": last_message_id}
 
-    with open(backup_file_path, "a", encoding="utf-8") as f:
-        for message in messages:
-            timestamp = message["timestamp"]
-            username = message["author"]["username"]
-            content = message["content"]
+    while True:
+        try:
+            wait_for_global_rate_limit()
+            # Don't start another request once a stop was requested
+            if stop_requested.is_set():
+                return None
+            request.prepare_url(url, params)
+            response = session.send(request, timeout=request_timeout)
+        except requests.exceptions.RequestException as e:
+            logging.error("Request failed for %s %s: %s", backup_type, item_name, e)
+            return None
 
-            # Write the regular message content
-            f.write(f"[{timestamp}] {username}: {content}\n")
+        # Rate limited: wait exactly as long as Discord asks, then retry the same page.
+        # A global limit applies to every route, so it pauses all channel threads.
+        if response.status_code == 429:
+            retry_after = float(response.headers.get("Retry-After", 1))
+            if response.headers.get("X-RateLimit-Global") or response.headers.get("X-RateLimit-Scope") == "global":
+                logging.warning("Global rate limit hit on %s %s, pausing all requests for %ss", backup_type, item_name, retry_after)
+                pause_all_requests(retry_after)
+            else:
+                logging.warning("Rate limited on %s %s, retrying in %ss", backup_type, item_name, retry_after)
+                stop_requested.wait(retry_after)
+            continue
 
-            # Check for attachments (images, files)
-            if "attachments" in message and message["attachments"]:
-                for attachment in message["attachments"]:
-                    if "url" in attachment:
-                        image_url = attachment["url"]
-                        # Download the image
-                        image_name = download_image(image_url, image_dir, timestamp, username, image_pbar)
-                        if image_name:
-                            f.write(f"[{timestamp}] {username} shared an image: images/{image_name}\n")
-                            logging.info(f"Image {image_name} associated with message from {username} at {timestamp}")
+        if response.status_code == 200:
+            return orjson.loads(response.content), response
 
-    image_pbar.close()
+        logging.error("Failed to fetch messages from %s %s: %s - %s", backup_type, item_name, response.status_code, response.text)
+        return None
 
 # Function to fetch and back up messages for a specific channel or topic
-def fetch_and_backup_messages(item_name, item_id, url, headers, delay_between_requests, backup_type='channel'):
-    logging.info(f"Fetching messages for {backup_type}: {item_name} (ID: {item_id})")
+def fetch_and_backup_messages(item_name, item_id, url, backup_type='channel'):
+    logging.info("Fetching messages for %s: %s (ID: %s)", backup_type, item_name, item_id)
+
+    backup_dir = Path("backups") / f"{backup_type}s" / item_name  # Use 'channels' or 'topics' based on type
+    image_dir = backup_dir / "images"  # Define the images directory within the backup directory
+    checkpoint_file = backup_dir / f"last_message_{item_name}.txt"  # Define the checkpoint file using the name and type
+    backup_file_path = backup_dir / f"{item_name}_messages.txt"  # Define the text file for backup messages
+    # Retrieve the last saved message ID; on the first run start from the very beginning of the channel
+    last_message_id = get_last_message_id(checkpoint_file) or "0"
+
+    # Prepare the request once (session headers merged); each page only swaps the query string
+    request = session.prepare_request(requests.Request("GET", url))
+
+    # Fetch the first page before touching the disk: when nothing is new (the common case
+    # on repeated runs) no folders, files, progress bars or writer thread are set up at all
+    page = fetch_page(request, url, last_message_id, backup_type, item_name)
+    if page is None:
+        return
+    if not page[0]:
+        logging.info("No new messages for %s %s", backup_type, item_name)
+        return
+
+    # Ensure the backup, image and thumbnail directories exist
+    image_dir.mkdir(parents=True, exist_ok=True)
+    (backup_dir / "thumbnails").mkdir(exist_ok=True)
+
+    # List the images already on disk once, instead of checking each attachment separately
+    with os.scandir(image_dir) as entries:
+        existing_images = {entry.name for entry in entries}
 
-    all_messages = []
-    backup_dir = f"backups/{backup_type}s/{item_name}/"  # Use 'channels' or 'topics' based on type
-    image_dir = os.path.join(backup_dir, "images/")  # Define the images directory within the backup directory
-    checkpoint_file = f"{backup_dir}last_message_{item_name}.txt"  # Define the checkpoint file using the name and type
-    backup_file_path = f"{backup_dir}{item_name}_messages.txt"  # Define the text file for backup messages
-    last_message_id = get_last_message_id(checkpoint_file)  # Retrieve the last saved message ID
+    channel_pbar = tqdm(total=None, desc=f"Backing up {backup_type} {item_name}", leave=True)
 
-    # Ensure the backup and image directories exist
-    os.makedirs(backup_dir, exist_ok=True)
-    os.makedirs(image_dir, exist_ok=True)
+    # Attachment downloads already started for this channel, keyed by URL without its query string
+    scheduled_downloads = {}
 
-    channel_pbar = tqdm(total=None, desc=f"Backing up {backup_type} {item_name}", leave=True)
+    # Only the newest fetched ID is tracked; pages are not kept once written
+    final_last_id = None
 
-    while True:
-        params = {"limit": int(100)}  # Ensure the limit is passed as an integer
-        if last_message_id:
-            params["after"] = last_message_id  # Get only messages after the last saved one
+    # Fetched pages are handed to a writer thread; the small bound keeps memory flat
+    page_queue = queue.Queue(maxsize=2)
+    writer_failed = threading.Event()
 
-        try:
-            response = requests.get(url, headers=headers, params=params)
-        except requests.exceptions.RequestException as e:
-            logging.error(f"Request failed for {backup_type} {item_name}: {e}")
-            break
+    # Keep the backup file open for the whole channel instead of reopening it per page
+    with open(backup_file_path, "ab", buffering=1 << 20) as backup_file, \
+            ThreadPoolExecutor(max_workers=1) as writer_executor:
+        writer = writer_executor.submit(
+            write_pages, page_queue, writer_failed, backup_file, checkpoint_file, channel_pbar
+        )
 
-        if response.status_code == 200:
-            messages = response.json()
+        try:
+            # Stop fetching as soon as the writer has failed or a stop was requested
+            while not writer_failed.is_set() and not stop_requested.is_set():
+                messages, response = page
+
+                # If no more messages, break the loop
+                if not messages:
+                    logging.info("No more messages to fetch for %s %s", backup_type, item_name)
+                    break
+
+                # Put the page oldest first by snowflake, so the file stays chronological whatever
+                # order Discord returned it in
+                messages.sort(key=lambda message: int(message["id"]))
+
+                # Intern author names so the few users repeated across pages share one string object
+                for message in messages:
+                    author = message["author"]
+                    author["username"] = sys.intern(author["username"])
+
+                # Update the last message ID for pagination: the newest message of the sorted page
+                last_message_id = messages[-1]["id"]
+                final_last_id = last_message_id
+
+                # Start the page's image downloads right away, then hand it to the writer
+                # and move straight on to the next fetch
+                try:
+                    entries = schedule_downloads(messages, image_dir, image_pbar, existing_images, scheduled_downloads)
+                except RuntimeError:
+                    # Ctrl-C shut the download pool down while this page was being scheduled;
+                    # the page is not queued, so it is fetched again on the next run
+                    if not stop_requested.is_set():
+                        raise
+                    break
+                page_queue.put((entries, last_message_id))
+
+                wait_for_rate_limit(response)
+                page = fetch_page(request, url, last_message_id, backup_type, item_name)
+                if page is None:
+                    break
+        finally:
+            # Always stop the writer, even when fetching failed, so leaving the executor never hangs
+            page_queue.put(None)
+
+        # Let the writer finish the queued pages; re-raises anything it failed with
+        try:
+            writer.result()
+        except CancelledError:
+            # Ctrl-C cancelled downloads of a queued page; that page was neither written nor
+            # checkpointed, so the next run fetches it again
+            if not stop_requested.is_set():
+                raise
+            logging.warning("Stopped %s %s before all queued pages were written", backup_type, item_name)
 
-            # If no more messages, break the loop
-            if not messages:
-                logging.info(f"No more messages to fetch for {backup_type} {item_name}")
-                break
+        # Make the channel's messages durable once, at the channel boundary
+        backup_file.flush()
+        os.fsync(backup_file.fileno())
 
-            # Write messages to the text file and download images
-            write_messages_to_file(messages, backup_file_path, image_dir)
+    if final_last_id:
+        logging.info("Saved last message ID for %s %s: %s", backup_type, item_name, final_last_id)
 
-            # Update the last message ID for pagination
-            last_message_id = messages[-1]["id"]
-            all_messages.extend(messages)
-            channel_pbar.update(len(messages))
+    channel_pbar.close()
 
-            time.sleep(delay_between_requests)
+# Function to back up a list of (name, ID, backup type) items, several at the same time
+def backup_all(items):
+    executor = ThreadPoolExecutor(max_workers=max_concurrent_channels)
+    futures = [
+        executor.submit(
+            fetch_and_backup_messages, item_name, item_id,
+            f"https://discord.com/api/v9/channels/{item_id}/messages", backup_type
+        )
+        for item_name, item_id, backup_type in items
+    ]
+    try:
+        # Re-raise any exception raised inside a worker thread
+        for future in futures:
+            future.result()
+    except KeyboardInterrupt:
+        # Tell the running channels to stop after their current page, drop the channels and
+        # downloads that have not started, and wait for the running ones so checkpoints stay consistent
+        logging.warning("Interrupted, stopping after the pages in progress")
+        stop_requested.set()
+        executor.shutdown(wait=False, cancel_futures=True)
+        download_executor.shutdown(wait=False, cancel_futures=True)
+        executor.shutdown(wait=True)
+        sys.exit("Backup interrupted; run the script again to resume from the last checkpoint")
+    finally:
+        executor.shutdown(wait=True)
+
+# Function to warn about IDs listed under more than one name, since each copy is fetched separately
+def warn_duplicate_ids(items):
+    seen = {}
+    for item_name, item_id in items:
+        # Channel IDs are strings and topic IDs are ints; compare them as ints
+        item_id = int(item_id)
+        if item_id in seen:
+            logging.warning("ID %s is listed as both %s and %s", item_id, seen[item_id], item_name)
         else:
-            logging.error(f"Failed to fetch messages from {backup_type} {item_name}: {response.status_code} - {response.text}")
-            break
+            seen[item_id] = item_name
 
-    if all_messages:
-        save_last_message_id(checkpoint_file, all_messages[-1]["id"])
-        logging.info(f"Saved last message ID for {backup_type} {item_name}: {all_messages[-1]['id']}")
+warn_duplicate_ids([*CHANNELS, *TOPICS.items()])
 
-    channel_pbar.close()
+# Stop early on a missing or invalid token instead of failing every channel
+if not check_token():
+    sys.exit(f"Discord token check failed, see {log_file} for details")
+
+# One image progress bar for the whole run, in bytes; its total grows as pages are fetched
+image_pbar = tqdm(total=0, desc="Downloading images", unit="B", unit_scale=True, unit_divisor=1024, leave=False)
 
-# Loop through each channel in CHANNELS and back up the messages
-for channel_name, channel_id in CHANNELS.items():
-    url = f"https://discord.com/api/v9/channels/{channel_id}/messages"
-    fetch_and_backup_messages(channel_name, channel_id, url, headers, delay_between_requests, backup_type='channel')
+# Back up every channel in CHANNELS and every topic in TOPICS from one shared pool,
+# so topics start as soon as a slot frees up instead of waiting for the slowest channel
+backup_all([
+    *((channel_name, channel_id, 'channel') for channel_name, channel_id in CHANNELS),
+    *((topic_name, topic_id, 'topic') for topic_name, topic_id in TOPICS.items()),
+])
 
-# Loop through each topic in TOPICS and back up the messages
-for topic_name, topic_id in TOPICS.items():
-    url = f"https://discord.com/api/v9/channels/{topic_id}/messages"
-    fetch_and_backup_messages(topic_name, topic_id, url, headers, delay_between_requests, backup_type='topic')
+# Wait for any remaining attachment downloads to finish
+download_executor.shutdown(wait=True)
+image_pbar.close()
 
 # Log that the script has finished
 logging.info("Discord Backup Script Completed")
@@ -13,19 +13,163 @@ Change Log:
     - Removed ImagePreloader class and threading-related code.
     - Simplified thumbnail creation and loading logic.
     - Fixed issue where thumbnails were not displaying with the posts.
+- **2026-10-15**:
+    - Missing thumbnails are created on a thread pool and swapped into a placeholder when ready.
+    - Messages are shown in a QListView backed by a list model instead of one QLabel per message.
+    - Uses the thumbnails main.py now creates at backup time, and only creates missing ones itself.
+    - Opens images with an explicit Pillow format and closes them as soon as the thumbnail is saved.
+    - Lists channel folders with os.scandir instead of os.listdir plus os.path.isdir.
 """
 
 import sys
 import os
 import re
 import signal
+from concurrent.futures import ThreadPoolExecutor
 from PyQt5.QtWidgets import (
-    QApplication, QWidget, QVBoxLayout, QHBoxLayout, QListWidget,
-    QLabel, QListWidgetItem, QScrollArea
+    QApplication, QWidget, QHBoxLayout, QListWidget,
+    QListWidgetItem, QListView
 )
-from PyQt5.QtGui import QPixmap
-from PyQt5.QtCore import Qt
-from PIL import Image
+from PyQt5.QtGui import QPixmap, QPixmapCache
+from PyQt5.QtCore import Qt, QAbstractListModel, QModelIndex, QSize, pyqtSignal
+from PIL import Image, UnidentifiedImageError
+
+# Attachment extensions the viewer can show as thumbnails
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.gif')
+
+# Pillow format for each image extension, so opening an image skips format detection
+IMAGE_FORMATS = {'.jpg': 'JPEG', '.jpeg': 'JPEG', '.png': 'PNG', '.gif': 'GIF'}
+
+# Backup line formats, compiled once: "[timestamp] user shared an image: path" and "[timestamp] user: text"
+IMAGE_LINE_RE = re.compile(r'\[([^\]]*)\] (.*?) shared an image: (.*)')
+MESSAGE_LINE_RE = re.compile(r'\[([^\]]*)\] (.*?): (.*)')
+IMAGE_MARKER = ' shared an image: '
+
+# Room reserved for an image row, so rows don't jump around when their thumbnail arrives
+THUMBNAIL_ROW_SIZE = QSize(220, 210)
+
+class MessageListModel(QAbstractListModel):
+    """
+    List model over a channel's parsed message tuples. The view only asks for the rows it is
+    showing, so Qt never builds widgets for messages that are scrolled out of sight.
+    """
+
+    # Emitted from a worker thread when a thumbnail has been created: (image path, thumbnail path)
+    thumbnail_ready = pyqtSignal(str, str)
+
+    def __init__(self, thumbnail_dir, thumbnail_pool):
+        super().__init__()
+        self.messages = []
+        self.thumbnail_dir = thumbnail_dir
+        self.thumbnail_pool = thumbnail_pool
+        self.thumbnail_jobs = {}
+        self.thumbnail_rows = {}
+        self.failed_thumbnails = set()
+        # Always queued, so a thumbnail that is already finished is never reported from inside data()
+        self.thumbnail_ready.connect(self.on_thumbnail_ready, Qt.QueuedConnection)
+
+    def set_messages(self, messages):
+        self.beginResetModel()
+        self.messages = messages
+        self.thumbnail_rows = {}
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.messages)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        msg_type, _, username, content = self.messages[index.row()]
+        if role == Qt.DisplayRole:
+            return f"{username}: {content}" if msg_type == 'text' else f"{username}:"
+        if msg_type == 'image':
+            if role == Qt.DecorationRole:
+                return self.thumbnail(index.row(), content)
+            if role == Qt.SizeHintRole:
+                return THUMBNAIL_ROW_SIZE
+        return None
+
+    def thumbnail(self, row, image_path):
+        """
+        Returns the thumbnail pixmap for an image row, or None while it is still being created.
+        The thumbnail made by the backup script is used when there is one; otherwise it is
+        created on the thumbnail pool and the row is repainted when ready.
+        """
+        pixmap = QPixmapCache.find(image_path)
+        if pixmap is not None and not pixmap.isNull():
+            return pixmap
+        if image_path in self.failed_thumbnails:
+            return None
+
+        # Prefer the thumbnail main.py created next to the channel's images
+        image_name = os.path.basename(image_path)
+        backup_thumbnail = os.path.join(os.path.dirname(os.path.dirname(image_path)), 'thumbnails', image_name)
+        if os.path.exists(backup_thumbnail):
+            return self.load_thumbnail(image_path, backup_thumbnail)
+
+        # Thumbnail already exists (and is not still being written): load it right away
+        thumbnail_path = os.path.join(self.thumbnail_dir, image_name)
+        if thumbnail_path not in self.thumbnail_jobs and os.path.exists(thumbnail_path):
+            return self.load_thumbnail(image_path, thumbnail_path)
+
+        # Otherwise create it in the background and remember which row to repaint
+        self.thumbnail_rows.setdefault(thumbnail_path, set()).add(row)
+        if thumbnail_path not in self.thumbnail_jobs:
+            future = self.thumbnail_pool.submit(self.create_thumbnail, image_path, thumbnail_path)
+            self.thumbnail_jobs[thumbnail_path] = future
+            # The callback runs on a worker thread; the signal hands the result back to the GUI thread
+            def report_thumbnail(finished):
+                # Jobs cancelled on quit also run the callback, but there is no thumbnail to report
+                if not finished.cancelled():
+                    self.thumbnail_ready.emit(image_path, thumbnail_path)
+            future.add_done_callback(report_thumbnail)
+        return None
+
+    def load_thumbnail(self, image_path, thumbnail_path):
+        pixmap = QPixmap(thumbnail_path)
+        if pixmap.isNull():
+            print(f"Failed to load thumbnail: {thumbnail_path}")
+            self.failed_thumbnails.add(image_path)
+            return None
+        QPixmapCache.insert(image_path, pixmap)
+        return pixmap
+
+    def on_thumbnail_ready(self, image_path, thumbnail_path):
+        """
+        Repaints the rows waiting on a finished thumbnail. Runs on the GUI thread.
+        """
+        self.thumbnail_jobs.pop(thumbnail_path, None)
+        self.load_thumbnail(image_path, thumbnail_path)
+        for row in self.thumbnail_rows.pop(thumbnail_path, ()):
+            index = self.index(row)
+            self.dataChanged.emit(index, index, [Qt.DecorationRole])
+
+    def create_thumbnail(self, image_path, thumbnail_path):
+        """
+        Creates a thumbnail of the image to speed up loading.
+        """
+        try:
+            image_format = IMAGE_FORMATS[os.path.splitext(image_path)[1].lower()]
+            try:
+                img = Image.open(image_path, formats=[image_format])
+            except UnidentifiedImageError:
+                # Misnamed attachment (e.g. a JPEG served as .png): let Pillow detect the format
+                img = Image.open(image_path)
+            # The with block closes the file as soon as the thumbnail is saved
+            with img:
+                if img.format == 'JPEG':
+                    # Let libjpeg decode at a reduced scale instead of decoding the full-size image
+                    img.draft('RGB', (400, 400))
+                # Bilinear is plenty for a 200px preview and much cheaper than the default filter
+                img.thumbnail((200, 200), Image.BILINEAR)
+                # Save based on the original file extension
+                if image_format in ('PNG', 'GIF'):
+                    img.save(thumbnail_path, "PNG")
+                else:
+                    img.convert("RGB").save(thumbnail_path, "JPEG", quality=75)
+        except Exception as e:
+            print(f"Error creating thumbnail for {image_path}: {e}")
 
 class DiscordClone(QWidget):
     """
@@ -36,8 +180,13 @@ class DiscordClone(QWidget):
         super().__init__()
         self.base_dir = base_dir
         self.data = {}
+        self.channel_files = {}
         self.thumbnail_dir = os.path.join(self.base_dir, 'thumbnails')
         os.makedirs(self.thumbnail_dir, exist_ok=True)
+
+        # Thumbnails are created off the GUI thread; Pillow releases the GIL while decoding
+        self.thumbnail_pool = ThreadPoolExecutor(max_workers=os.cpu_count())
+
         self.setup_window()
         self.initUI()
         self.load_data()
@@ -60,36 +209,38 @@ class DiscordClone(QWidget):
         self.channel_list.itemClicked.connect(self.display_channel)
         main_layout.addWidget(self.channel_list, 1)
 
-        self.message_area = QScrollArea()
-        self.message_area_widget = QWidget()
-        self.message_layout = QVBoxLayout(self.message_area_widget)
-        self.message_area.setWidget(self.message_area_widget)
-        self.message_area.setWidgetResizable(True)
-        main_layout.addWidget(self.message_area, 3)
+        # Messages are rows of a model rather than one QLabel each
+        self.message_model = MessageListModel(self.thumbnail_dir, self.thumbnail_pool)
+        self.message_view = QListView()
+        self.message_view.setModel(self.message_model)
+        self.message_view.setWordWrap(True)
+        self.message_view.setIconSize(QSize(200, 200))
+        self.message_view.setSpacing(5)
+        self.message_view.setLayoutMode(QListView.Batched)
+        self.message_view.setResizeMode(QListView.Adjust)
+        self.message_view.setVerticalScrollMode(QListView.ScrollPerPixel)
+        self.message_view.setSelectionMode(QListView.NoSelection)
+        self.message_view.setStyleSheet("font-size: 14px;")
+        main_layout.addWidget(self.message_view, 3)
 
         self.setLayout(main_layout)
 
     def load_data(self):
         channels_path = os.path.join(self.base_dir, 'backups', 'channels')
-        channels = [
-            d for d in os.listdir(channels_path)
-            if os.path.isdir(os.path.join(channels_path, d))
-        ]
+        # scandir reports each entry's type itself, so there is no stat call per channel folder
+        with os.scandir(channels_path) as entries:
+            channels = [entry.name for entry in entries if entry.is_dir(follow_symlinks=False)]
 
+        # Only record where each channel's messages live; files are parsed on first view
         for channel in channels:
-            self.load_channel(channel, channels_path)
-
-    def load_channel(self, channel, channels_path):
-        channel_path = os.path.join(channels_path, channel)
-        message_file = os.path.join(channel_path, f"{channel}_messages.txt")
+            channel_path = os.path.join(channels_path, channel)
+            message_file = os.path.join(channel_path, f"{channel}_messages.txt")
+            if os.path.exists(message_file):
+                self.channel_files[channel] = (message_file, channel_path)
 
-        if os.path.exists(message_file):
-            messages = self.parse_messages(message_file, channel_path)
-            self.data[channel] = messages
-
-            # Add channel to the list
-            item = QListWidgetItem(channel)
-            self.channel_list.addItem(item)
+                # Add channel to the list
+                item = QListWidgetItem(channel)
+                self.channel_list.addItem(item)
 
     def parse_messages(self, file_path, channel_dir):
         messages = []
@@ -98,113 +249,64 @@ class DiscordClone(QWidget):
                 for line in f:
                     result = self.parse_line(line)
                     if result:
-                        msg_dict = self.create_message_dict(result, channel_dir)
-                        if msg_dict:
-                            messages.append(msg_dict)
+                        msg = self.create_message(result, channel_dir)
+                        if msg:
+                            messages.append(msg)
         except Exception as e:
             print(f"Error parsing messages: {e}")
         return messages
 
     def parse_line(self, line):
-        pattern_image = r'\[(.*?)\] (.*?) shared an image: (.*)'
-        pattern_message = r'\[(.*?)\] (.*?): (.*)'
-
-        match_image = re.match(pattern_image, line)
+        # Fast path: split "[timestamp] rest" with plain string searches instead of the regex engine
+        if line.startswith('['):
+            bracket = line.find('] ', 1)
+            if bracket > 0:
+                timestamp = line[1:bracket]
+                rest = line[bracket + 2:].rstrip('\n')
+
+                marker = rest.find(IMAGE_MARKER)
+                if marker >= 0:
+                    return timestamp, rest[:marker], rest[marker + len(IMAGE_MARKER):], 'image'
+
+                colon = rest.find(': ')
+                if colon >= 0:
+                    return timestamp, rest[:colon], rest[colon + 2:], 'text'
+
+        # Fall back to the regexes for anything the fast path could not split
+        match_image = IMAGE_LINE_RE.match(line)
         if match_image:
             return match_image.groups() + ('image',)
 
-        match_message = re.match(pattern_message, line)
+        match_message = MESSAGE_LINE_RE.match(line)
         if match_message:
             return match_message.groups() + ('text',)
 
         return None
 
-    def create_message_dict(self, parsed_data, channel_dir):
+    def create_message(self, parsed_data, channel_dir):
+        """
+        Returns a lightweight (type, timestamp, username, content) tuple, or None for skipped attachments.
+        """
         timestamp, username, content, msg_type = parsed_data
         if msg_type == 'image':
-            image_path = os.path.join(channel_dir, content)
-            if not image_path.lower().endswith(('.png', '.jpg', '.jpeg', '.gif')):
+            # Reject non-image attachments before building their path
+            if not content.lower().endswith(IMAGE_EXTENSIONS):
                 return None
-            return {'type': 'image', 'timestamp': timestamp, 'username': username, 'content': image_path}
-        return {'type': 'text', 'timestamp': timestamp, 'username': username, 'content': content}
+            image_path = os.path.join(channel_dir, content)
+            return ('image', timestamp, username, image_path)
+        return ('text', timestamp, username, content)
 
     def display_channel(self, item):
-        self.clear_message_layout()
-
-        # Determine which channel was clicked
+        # Determine which channel was clicked, and parse its messages the first time it is opened
         channel_name = item.text()
-        if channel_name in self.data:
-            for msg in self.data[channel_name]:
-                if msg:
-                    self.display_message(msg)
-
-    def clear_message_layout(self):
-        for i in reversed(range(self.message_layout.count())):
-            widget = self.message_layout.itemAt(i).widget()
-            if widget:
-                widget.setParent(None)
-
-    def display_message(self, msg):
-        if msg['type'] == 'text':
-            self.display_text(msg['username'], msg['content'])
-        elif msg['type'] == 'image':
-            self.display_image_thumbnail(msg['username'], msg['content'])
-
-    def display_text(self, username, content):
-        label = QLabel(f"{username}: {content}")
-        label.setWordWrap(True)
-        label.setStyleSheet("font-size: 14px; padding: 5px;")
-        self.message_layout.addWidget(label)
-
-    def display_image_thumbnail(self, username, image_path):
-        """
-        Displays a thumbnail instead of the full image.
-        """
-        thumbnail_path = os.path.join(self.thumbnail_dir, os.path.basename(image_path))
-
-        # Check if thumbnail exists; if not, create it
-        if not os.path.exists(thumbnail_path):
-            try:
-                self.create_thumbnail(image_path, thumbnail_path)
-            except Exception as e:
-                print(f"Error creating thumbnail for {image_path}: {e}")
-                return  # Exit if thumbnail creation fails
-
-        # Load the thumbnail synchronously
-        pixmap = QPixmap(thumbnail_path)
-        if pixmap.isNull():
-            print(f"Failed to load thumbnail: {thumbnail_path}")
-            return
-
-        self.show_thumbnail(username, pixmap)
-
-    def create_thumbnail(self, image_path, thumbnail_path):
-        """
-        Creates a thumbnail of the image to speed up loading.
-        """
-        try:
-            img = Image.open(image_path)
-            img.thumbnail((200, 200))
-            # Save based on the original file extension
-            ext = os.path.splitext(image_path)[1].lower()
-            if ext in ['.png', '.gif']:
-                img.save(thumbnail_path, "PNG")
-            else:
-                img.convert("RGB").save(thumbnail_path, "JPEG")
-        except Exception as e:
-            print(f"Error creating thumbnail for {image_path}: {e}")
-
-    def show_thumbnail(self, username, pixmap):
-        user_label = QLabel(f"{username}:")
-        user_label.setStyleSheet("font-size: 14px; padding: 5px;")
-        self.message_layout.addWidget(user_label)
-
-        image_label = QLabel()
-        image_label.setPixmap(pixmap)
-        self.message_layout.addWidget(image_label)
+        if channel_name not in self.data and channel_name in self.channel_files:
+            self.data[channel_name] = self.parse_messages(*self.channel_files[channel_name])
+        self.message_model.set_messages(self.data.get(channel_name, []))
+        self.message_view.scrollToTop()
 
     def cleanup_threads(self):
-        pass  # No threads to clean up since we're loading synchronously
+        # Drop queued thumbnails; the ones already being created finish on their own
+        self.thumbnail_pool.shutdown(wait=False, cancel_futures=True)
 
 if __name__ == '__main__':
     app = QApplication(sys.argv)
@@ -1,59 +1,91 @@
 """
 topics.py
 
-This module defines the `topic` class, which encapsulates information about a Discord topic.
-Each topic object stores the topic ID and the topic name, and provides methods
-to retrieve these details.
+This module defines the `Topic` class, which encapsulates information about a Discord topic.
+Each topic object is an immutable named tuple holding the topic ID and the topic name,
+available as the `topic_id` and `name` attributes.
 
 Author: GandalfTheSysAdmin
 Date: 2024-08-31
 
 Class:
-    - topic: Stores topic-specific information like topic ID and name.
+    - Topic: Stores topic-specific information like topic ID and name.
 
 Usage:
-    - Import the `topic` class in your script.
-    - Create an instance of `topic` by passing the topic ID and name as arguments.
+    - Import the `Topic` class in your script.
+    - Create an instance of `Topic` by passing the topic ID and name as arguments,
+      or use `Topic.from_id(topic_id)` to get the shared instance for a known topic.
+    - Use `BY_NAME[name]` or `BY_ID[topic_id]` to get the prebuilt `Topic`, or iterate `ALL_TOPICS`.
+    - Each topic ID may appear only once in `TOPICS` (importing fails otherwise);
+      add extra names for a topic to `ALIASES`.
 
 Example:
-    from topics import topic
-    topic = topic('1166422305069600870', 'general')
+    from topics import Topic
+    topic = Topic(1166422305069600870, 'general')
 
 License: MIT License
 """
 
-TOPICS = {
-	'automation': '1152724568788713502',
-	'breeding': '1161819028050948097',
-	'cannabis-info-files': '1152724428170481744',
-	'concentrates': '1153031967525326918',
-	'edibles': '1153032189437542561',
-	'podcast-suggestions': '1157401550050820136',
-	'gaming': '1153031305257299991',
-	'indoor-growing': '1152724355432853534',
-	'pest-management': '1153031886583644173',
-	'propagation-tech': '1153034060264902656',
-    'science': '1166422305069600870',
-	'lighting': '1153033640519946414',
-	'natural-farming': '1152724626368122971',
-	'strains': '1153233929411768370', 
-	'wall-street-bets': '1153043405123891281', 
-	'everything-organics': '1245817702086475826',
+from collections import Counter
+from types import MappingProxyType
+from typing import Final, Mapping, NamedTuple, final
+
+# Map each topic name to its Discord ID, stored as an int (IDs are 64-bit snowflakes);
+# the mapping is read-only so it can be shared without copying
+TOPICS: Final[Mapping[str, int]] = MappingProxyType({
+    'automation': 1152724568788713502,
+    'breeding': 1161819028050948097,
+    'cannabis-info-files': 1152724428170481744,
+    'concentrates': 1153031967525326918,
+    'edibles': 1153032189437542561,
+    'podcast-suggestions': 1157401550050820136,
+    'gaming': 1153031305257299991,
+    'indoor-growing': 1152724355432853534,
+    'pest-management': 1153031886583644173,
+    'propagation-tech': 1153034060264902656,
+    'science': 1166422305069600870,
+    'lighting': 1153033640519946414,
+    'natural-farming': 1152724626368122971,
+    'strains': 1153233929411768370,
+    'wall-street-bets': 1153043405123891281,
+    'everything-organics': 1245817702086475826,
     # Add more topics here
-}
+})
+
+# Extra names for a topic (alias -> name in TOPICS); list a second name for the same ID
+# here instead of adding it to TOPICS
+ALIASES: Final[Mapping[str, str]] = MappingProxyType({
+    # 'alias-name': 'topic-name',
+})
+
+# Every topic needs its own ID, otherwise the reverse lookups below would silently drop a name
+duplicate_ids = [topic_id for topic_id, count in Counter(TOPICS.values()).items() if count > 1]
+if duplicate_ids:
+    raise ValueError(f"Duplicate topic IDs in TOPICS (use ALIASES instead): {duplicate_ids}")
+del duplicate_ids
+
+# Reverse lookup (ID -> name), built once so finding a topic by ID never scans TOPICS
+ID_TO_NAME: Final[Mapping[int, str]] = MappingProxyType(dict(zip(TOPICS.values(), TOPICS.keys())))
 
 
-class Topic:
-    def __init__(self, topic_id, name):
-        self.topic_id = topic_id
-        self.name = name
+@final
+class Topic(NamedTuple):
+    topic_id: int
+    name: str
 
-    def __repr__(self):
-        return f"topic(name='{self.name}', topic_id='{self.topic_id}')"
+    @classmethod
+    def from_id(cls, topic_id: int) -> "Topic":
+        # Return the shared instance from BY_ID rather than building a new Topic per call
+        return BY_ID[topic_id]
 
-    def get_topic_id(self):
-        return self.topic_id
 
-    def get_topic_name(self):
-        return self.name
+# Every topic as a Topic, built once at import
+ALL_TOPICS: Final[tuple[Topic, ...]] = tuple(Topic(topic_id, name) for name, topic_id in TOPICS.items())
 
+# Topic for each ID (IDs are ints, which hash to themselves), and for each name
+# (aliases resolve to their topic's instance)
+BY_ID: Final[Mapping[int, Topic]] = MappingProxyType({topic.topic_id: topic for topic in ALL_TOPICS})
+BY_NAME: Final[Mapping[str, Topic]] = MappingProxyType({
+    **{topic.name: topic for topic in ALL_TOPICS},
+    **{alias: BY_ID[TOPICS[name]] for alias, name in ALIASES.items()},
+})